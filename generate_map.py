@@ -1,20 +1,114 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
 
+import gzip
 import json
 import os
+import queue
 import sys
-from typing import Dict, Any, List
+import threading
+import time
+from bisect import bisect_right
+from typing import Dict, Any, List, Set, Tuple
 
-import requests
-import folium
+try:
+    import orjson
+except ImportError:  # orjson est facultatif : repli sur le module json standard
+    orjson = None
+
+try:
+    import numpy as np
+except ImportError:  # numpy est facultatif : simplification en Python pur
+    np = None
+
+
+# Cache local du GeoJSON des régions (évite un aller-retour réseau à chaque exécution)
+_CACHE_PATH = os.path.join(".cache", "regions.geojson")
+_TTL = 7 * 86400  # secondes
+_MAX_BYTES = 20_000_000  # taille maximale acceptée pour une réponse
+_TIMEOUT = (3, 6)  # secondes (connexion, lecture) par requête
+_BUDGET = 25.0  # secondes, durée totale maximale de la récupération réseau
+
+
+def _json_loads(content: bytes) -> Any:
+    """
+    Décode un document JSON (orjson si disponible, sinon json).
+    """
+    if orjson is not None:
+        return orjson.loads(content)
+    return json.loads(content)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """
+    Encode un objet en JSON compact UTF-8 (orjson si disponible, sinon json).
+    """
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _normalize_properties(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalisation basique des propriétés pour s'aligner sur geo.api (nom/code).
+    """
+    for feat in data.get("features", []):
+        props = feat.get("properties", {}) or {}
+        if "nom" not in props and "name" in props:
+            props["nom"] = props["name"]
+        if "code" not in props:
+            for key in ("code_insee", "code_region", "id"):
+                if key in props:
+                    props["code"] = props[key]
+                    break
+        feat["properties"] = props
+    return data
+
+
+def _write_cache(content: bytes) -> None:
+    """
+    Écrit le contenu brut reçu dans le cache, de façon atomique.
+    """
+    try:
+        os.makedirs(os.path.dirname(_CACHE_PATH), exist_ok=True)
+        tmp = _CACHE_PATH + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(content)
+        os.replace(tmp, _CACHE_PATH)
+    except OSError:
+        pass
+
+
+def _close_after(session: Any, threads: List[threading.Thread]) -> None:
+    """
+    Ferme la session une fois les threads terminés, sans bloquer l'appelant.
+    """
+    def close() -> None:
+        for t in threads:
+            t.join()
+        session.close()
+
+    if any(t.is_alive() for t in threads):
+        threading.Thread(target=close, daemon=True).start()
+    else:
+        close()
 
 
 def fetch_regions_geojson() -> Dict[str, Any]:
     """
     Récupère les régions de France, d'abord via geo.api.gouv.fr (GeoJSON),
     puis via des sources publiques de secours si nécessaire.
+    Le résultat est mis en cache localement (.cache/regions.geojson) pendant 7 jours.
     """
+    try:
+        if time.time() - os.path.getmtime(_CACHE_PATH) < _TTL:
+            with open(_CACHE_PATH, "rb") as f:
+                data = _json_loads(f.read())
+            if isinstance(data, dict) and data.get("features"):
+                return _normalize_properties(data)
+    except (OSError, ValueError):
+        pass
+
     candidate_urls: List[str] = [
         # Essais geo.api.gouv.fr (avec variantes de paramètres)
         "https://geo.api.gouv.fr/regions?format=geojson&geometry=contour&projection=WGS84",
@@ -24,45 +118,126 @@ def fetch_regions_geojson() -> Dict[str, Any]:
         "https://geo.api.gouv.fr/regions?format=geojson",
         "https://geo.api.gouv.fr/regions?projection=WGS84&format=geojson",
     ]
-    last_err: Exception | None = None
-
-    for url in candidate_urls:
-        try:
-            r = requests.get(url, timeout=30)
-            r.raise_for_status()
-            data = r.json()
-            if isinstance(data, dict) and data.get("features"):
-                return data
-        except Exception as e:  # noqa: BLE001
-            last_err = e
-            continue
-
     # Fallback: jeux de données GeoJSON publics (mêmes régions, géométries propres)
     fallbacks: List[str] = [
         "https://france-geojson.gregoiredavid.fr/repo/regions.geojson",
         "https://raw.githubusercontent.com/gregoiredavid/france-geojson/master/regions.geojson",
     ]
-    for url in fallbacks:
-        try:
-            r = requests.get(url, timeout=30)
+    last_err: Exception | None = None
+
+    # Import différé : inutile quand le cache est valide
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    # Relances avec attente exponentielle (urllib3 : 0 s puis 0,5 s) sur erreurs 5xx/connexion
+    # uniquement, une seule sur échec de connexion. Pas de relance sur délai de lecture, et
+    # Retry-After est ignoré pour borner la durée totale. Un 4xx échoue immédiatement et l'on
+    # passe à l'URL suivante.
+    retry = Retry(
+        total=2,
+        connect=1,
+        read=0,
+        backoff_factor=0.25,
+        status_forcelist=(500, 502, 503, 504),
+        respect_retry_after_header=False,
+    )
+    # Une seule session : connexion keep-alive réutilisée (une seule poignée de main TLS par hôte)
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=retry))
+
+    # Budget global : aucune tentative ne démarre ni ne se poursuit au-delà de l'échéance
+    deadline = time.monotonic() + _BUDGET
+
+    def probe(url: str, cancel: threading.Event | None = None) -> Tuple[Dict[str, Any], bytes] | None:
+        # Lecture en flux, plafonnée : une réponse anormalement volumineuse est rejetée.
+        # Le téléchargement est abandonné dès que `cancel` est positionné ou le budget épuisé.
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"Budget de {_BUDGET:.0f} s épuisé: {url}")
+        # Délais réduits en fin de budget : 3 tentatives (connexion + lecture) tiennent dans le reste
+        step = remaining / 6
+        timeout = (min(_TIMEOUT[0], step), min(_TIMEOUT[1], step))
+        with session.get(url, timeout=timeout, stream=True) as r:
             r.raise_for_status()
-            data = r.json()
-            if isinstance(data, dict) and data.get("features"):
-                # Normalisation basique des propriétés pour s'aligner sur geo.api (nom/code)
-                for feat in data.get("features", []):
-                    props = feat.get("properties", {}) or {}
-                    if "nom" not in props and "name" in props:
-                        props["nom"] = props["name"]
-                    if "code" not in props:
-                        for key in ("code_insee", "code_region", "id"):
-                            if key in props:
-                                props["code"] = props[key]
-                                break
-                    feat["properties"] = props
-                return data
+            if int(r.headers.get("content-length") or 0) > _MAX_BYTES:
+                raise ValueError(f"Réponse trop volumineuse: {url}")
+            body = bytearray()
+            for chunk in r.iter_content(chunk_size=1 << 16):
+                if cancel is not None and cancel.is_set():
+                    return None
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Budget de {_BUDGET:.0f} s épuisé: {url}")
+                body += chunk
+                if len(body) > _MAX_BYTES:
+                    raise ValueError(f"Réponse trop volumineuse: {url}")
+        content = bytes(body)
+        data = _json_loads(content)
+        if isinstance(data, dict) and data.get("features"):
+            return data, content
+        return None
+
+    # Les deux variantes les plus probables sont interrogées en parallèle :
+    # la latence totale est celle de la plus rapide, pas la somme.
+    cancel = threading.Event()
+    results: queue.Queue = queue.Queue()
+
+    def race(url: str) -> None:
+        try:
+            results.put((probe(url, cancel), None))
         except Exception as e:  # noqa: BLE001
-            last_err = e
-            continue
+            results.put((None, e))
+
+    # Threads démons : la requête perdante ne retient ni le retour, ni la fin du processus
+    racers = [threading.Thread(target=race, args=(url,), daemon=True) for url in candidate_urls[:2]]
+    for t in racers:
+        t.start()
+
+    # Échec au niveau de l'hôte geo.api.gouv.fr (connexion impossible, ou aucune réponse dans
+    # le délai : requests les remonte en ConnectionError) : ses autres variantes sont sautées
+    host_down = False
+
+    try:
+        try:
+            for _ in racers:
+                found, err = results.get()
+                if err is not None:
+                    last_err = err
+                    host_down = host_down or isinstance(err, requests.ConnectionError)
+                elif found:
+                    _write_cache(found[1])
+                    return found[0]
+        finally:
+            # Interrompre la requête perdante (vérifié entre deux blocs reçus)
+            cancel.set()
+
+        # Puis les autres variantes, séquentiellement
+        for url in candidate_urls[2:]:
+            if host_down or time.monotonic() >= deadline:
+                break
+            try:
+                found = probe(url)
+                if found:
+                    _write_cache(found[1])
+                    return found[0]
+            except Exception as e:  # noqa: BLE001
+                last_err = e
+                host_down = isinstance(e, requests.ConnectionError)
+                continue
+
+        for url in fallbacks:
+            if time.monotonic() >= deadline:
+                break
+            try:
+                found = probe(url)
+                if found:
+                    _write_cache(found[1])
+                    return _normalize_properties(found[0])
+            except Exception as e:  # noqa: BLE001
+                last_err = e
+                continue
+    finally:
+        _close_after(session, racers)
 
     raise SystemExit(
         "Impossible de récupérer les régions (geo.api.gouv.fr et sources de secours indisponibles). "
@@ -70,223 +245,386 @@ def fetch_regions_geojson() -> Dict[str, Any]:
     )
 
 
+def _rdp(points: List[List[float]], tolerance: float) -> List[List[float]]:
+    """
+    Ramer–Douglas–Peucker itératif (pile explicite, pas de récursion).
+    Conserve toujours le premier et le dernier point.
+    """
+    n = len(points)
+    if n < 3:
+        return points
+    if np is not None:
+        return _rdp_numpy(points, tolerance)
+    keep = [False] * n
+    keep[0] = keep[-1] = True
+    tol2 = tolerance * tolerance
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        x1, y1 = points[i][0], points[i][1]
+        dx, dy = points[j][0] - x1, points[j][1] - y1
+        seg2 = dx * dx + dy * dy
+        best, idx = -1.0, -1
+        for k in range(i + 1, j):
+            px, py = points[k][0] - x1, points[k][1] - y1
+            if seg2:
+                cross = dx * py - dy * px
+                d2 = cross * cross / seg2
+            else:
+                d2 = px * px + py * py
+            if d2 > best:
+                best, idx = d2, k
+        if best > tol2:
+            keep[idx] = True
+            stack.append((i, idx))
+            stack.append((idx, j))
+    return [pt for pt, k in zip(points, keep) if k]
+
+
+def _rdp_numpy(points: List[List[float]], tolerance: float) -> List[List[float]]:
+    """
+    Variante vectorisée de _rdp : les distances de tous les points intermédiaires
+    au segment courant sont calculées en une seule opération NumPy.
+    """
+    pts = np.asarray(points, dtype=float)[:, :2]
+    n = len(pts)
+    keep = np.zeros(n, dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, n - 1)]
+    while stack:
+        i, j = stack.pop()
+        if j - i < 2:
+            continue
+        dx, dy = pts[j] - pts[i]
+        rel = pts[i + 1:j] - pts[i]
+        norm = np.hypot(dx, dy)
+        if norm:
+            dist = np.abs(dx * rel[:, 1] - dy * rel[:, 0]) / norm
+        else:
+            dist = np.hypot(rel[:, 0], rel[:, 1])
+        k = int(dist.argmax())
+        if dist[k] > tolerance:
+            idx = i + 1 + k
+            keep[idx] = True
+            stack.append((i, idx))
+            stack.append((idx, j))
+    return pts[keep].tolist()
+
+
+def _quantize(points: List[List[float]], ndigits: int = 5) -> List[List[float]]:
+    """
+    Arrondit les coordonnées (5 décimales ≈ 1 m) et supprime les sommets consécutifs
+    devenus identiques après arrondi.
+    """
+    out: List[List[float]] = []
+    for pt in points:
+        q = [round(pt[0], ndigits), round(pt[1], ndigits)]
+        if not out or q != out[-1]:
+            out.append(q)
+    return out
+
+
+def _minimal_ring(ring: List[List[float]]) -> List[List[float]]:
+    """
+    Plus petit anneau valide approchant `ring` : premier point, point le plus éloigné,
+    point le plus éloigné de ce segment, puis fermeture.
+    """
+    if len(ring) < 4:
+        return ring
+    x0, y0 = ring[0][0], ring[0][1]
+    far = max(ring, key=lambda pt: (pt[0] - x0) ** 2 + (pt[1] - y0) ** 2)
+    dx, dy = far[0] - x0, far[1] - y0
+    third = max(ring, key=lambda pt: abs(dx * (pt[1] - y0) - dy * (pt[0] - x0)))
+    return [ring[0], far, third, ring[0]]
+
+
+def _simplify_ring(ring: List[List[float]], tolerance: float) -> List[List[float]] | None:
+    """
+    Simplifie un anneau fermé et quantifie ses coordonnées.
+    Un anneau réduit à moins de 4 points (îlot) est remplacé par un anneau minimal valide ;
+    s'il dégénère encore après arrondi, None est renvoyé.
+    """
+    simplified = _quantize(_rdp(ring, tolerance))
+    if len(simplified) < 4:
+        simplified = _quantize(_minimal_ring(ring))
+    return simplified if len(simplified) >= 4 else None
+
+
+def _simplify_polygon(rings: List[List[List[float]]], tolerance: float) -> List[List[List[float]]]:
+    """
+    Simplifie un polygone (extérieur + trous). Les trous dégénérés sont supprimés ;
+    si l'anneau extérieur dégénère, le polygone entier est supprimé (liste vide).
+    """
+    out = [_simplify_ring(r, tolerance) for r in rings]
+    if not out or out[0] is None:
+        return []
+    return [r for r in out if r is not None]
+
+
+def simplify_geojson(geojson: Dict[str, Any], tolerance_deg: float = 0.01) -> Dict[str, Any]:
+    """
+    Simplifie les contours des régions (Douglas–Peucker) pour alléger la page générée.
+    Aux niveaux de zoom utilisés (5–6), l'essentiel des sommets est sous le pixel.
+    """
+    for feat in geojson.get("features", []):
+        geom = feat.get("geometry") or {}
+        coords = geom.get("coordinates")
+        if not coords:
+            continue
+        if geom.get("type") == "Polygon":
+            polys = [coords]
+        elif geom.get("type") == "MultiPolygon":
+            polys = coords
+        else:
+            continue
+        simplified = [p for p in (_simplify_polygon(poly, tolerance_deg) for poly in polys) if p]
+        if not simplified:
+            # Géométrie plus petite que la précision retenue (~1 m) : invisible, donc retirée
+            feat["geometry"] = None
+        elif geom["type"] == "Polygon":
+            geom["coordinates"] = simplified[0]
+        else:
+            geom["coordinates"] = simplified
+    return geojson
+
+
+# Seuils de densité (hab/km²) et couleurs de remplissage associées
+_DENSITY_THRESHOLDS = (50.0, 100.0, 150.0, 250.0, 500.0)
+_DENSITY_COLORS = ("#D4EEFF", "#9BD1FF", "#6FB2FF", "#3D7CFF", "#2E6EEA", "#1F4DBF")
+_DENSITY_LABELS = ("&lt; 50", "50–100", "100–150", "150–250", "250–500", "≥ 500")
+
+
+def density_color(d: Any) -> str:
+    """
+    Couleur de remplissage selon la densité (hab/km²).
+    """
+    try:
+        d = float(d)
+    except (TypeError, ValueError):
+        return "#2E6EEA"
+    return _DENSITY_COLORS[bisect_right(_DENSITY_THRESHOLDS, d)]
+
+
+# Infos indicatives par région (valeurs approximatives, ordre de grandeur, pour démonstration)
+_REGIONS_META: Dict[str, Dict[str, Any]] = {
+    "Île-de-France": {"population": 12271794, "surface_km2": 12012},
+    "Auvergne-Rhône-Alpes": {"population": 8078271, "surface_km2": 69711},
+    "Nouvelle-Aquitaine": {"population": 6073000, "surface_km2": 84036},
+    "Occitanie": {"population": 5999000, "surface_km2": 72724},
+    "Grand Est": {"population": 5549000, "surface_km2": 57441},
+    "Hauts-de-France": {"population": 6006000, "surface_km2": 31813},
+    "Provence-Alpes-Côte d'Azur": {"population": 5098000, "surface_km2": 31400},
+    "Pays de la Loire": {"population": 3883000, "surface_km2": 32082},
+    "Bretagne": {"population": 3420000, "surface_km2": 27208},
+    "Centre-Val de Loire": {"population": 2573000, "surface_km2": 39151},
+    "Bourgogne-Franche-Comté": {"population": 2807000, "surface_km2": 47784},
+    "Normandie": {"population": 3330000, "surface_km2": 29906},
+    "Corse": {"population": 351000, "surface_km2": 8680},
+    "Guadeloupe": {"population": 376000, "surface_km2": 1628},
+    "Martinique": {"population": 353000, "surface_km2": 1128},
+    "Guyane": {"population": 294000, "surface_km2": 83846},
+    "La Réunion": {"population": 859000, "surface_km2": 2512},
+    "Mayotte": {"population": 310000, "surface_km2": 376},
+}
+
+# Valeurs dérivées calculées une seule fois, à l'import du module
+_TOTAL_POP = sum(v["population"] for v in _REGIONS_META.values())
+for _meta in _REGIONS_META.values():
+    _meta["surface_km2"] = float(_meta["surface_km2"])
+    _meta["densite_km2"] = round(_meta["population"] / _meta["surface_km2"], 1)
+    _meta["part_population_pct"] = round(100 * _meta["population"] / _TOTAL_POP, 2)
+    _meta["_fill"] = density_color(_meta["densite_km2"])
+del _meta
+
+_DEFAULT_FILL = density_color(None)
+
+
 def enrich_regions_metadata(geojson: Dict[str, Any]) -> None:
     """
     Enrichit chaque région avec des infos indicatives (population, surface, densité, part de pop.).
-    Valeurs approximatives (ordre de grandeur) pour démonstration.
-    """
-    mapping = {
-        "Île-de-France": {"population": 12271794, "surface_km2": 12012},
-        "Auvergne-Rhône-Alpes": {"population": 8078271, "surface_km2": 69711},
-        "Nouvelle-Aquitaine": {"population": 6073000, "surface_km2": 84036},
-        "Occitanie": {"population": 5999000, "surface_km2": 72724},
-        "Grand Est": {"population": 5549000, "surface_km2": 57441},
-        "Hauts-de-France": {"population": 6006000, "surface_km2": 31813},
-        "Provence-Alpes-Côte d'Azur": {"population": 5098000, "surface_km2": 31400},
-        "Pays de la Loire": {"population": 3883000, "surface_km2": 32082},
-        "Bretagne": {"population": 3420000, "surface_km2": 27208},
-        "Centre-Val de Loire": {"population": 2573000, "surface_km2": 39151},
-        "Bourgogne-Franche-Comté": {"population": 2807000, "surface_km2": 47784},
-        "Normandie": {"population": 3330000, "surface_km2": 29906},
-        "Corse": {"population": 351000, "surface_km2": 8680},
-        "Guadeloupe": {"population": 376000, "surface_km2": 1628},
-        "Martinique": {"population": 353000, "surface_km2": 1128},
-        "Guyane": {"population": 294000, "surface_km2": 83846},
-        "La Réunion": {"population": 859000, "surface_km2": 2512},
-        "Mayotte": {"population": 310000, "surface_km2": 376},
-    }
-    total_pop = sum(v["population"] for v in mapping.values())
+    Les valeurs (y compris la couleur de remplissage "_fill") sont pré-calculées dans _REGIONS_META.
+    """
     for feat in geojson.get("features", []):
-        props = feat.get("properties", {}) or {}
-        name = props.get("nom") or props.get("name")
-        meta = mapping.get(name)
+        props = feat.get("properties") or {}
+        meta = _REGIONS_META.get(props.get("nom") or props.get("name"))
         if meta:
-            pop = int(meta["population"])
-            surf = float(meta["surface_km2"])
-            dens = round(pop / surf, 1) if surf else None
-            props["population"] = pop
-            props["surface_km2"] = surf
-            props["densite_km2"] = dens
-            if total_pop:
-                props["part_population_pct"] = round(100 * pop / total_pop, 2)
+            props.update(meta)
+        else:
+            props["_fill"] = _DEFAULT_FILL
         feat["properties"] = props
 
 
-def build_map(geojson: Dict[str, Any], out_file: str = "index.html") -> None:
+# Régions d'outre-mer, exclues du cadrage initial (vue centrée sur la métropole)
+_OVERSEAS = {"Guadeloupe", "Martinique", "Guyane", "La Réunion", "Mayotte"}
+
+
+def bbox(geojson: Dict[str, Any], exclude: Set[str] = _OVERSEAS) -> List[List[float]] | None:
     """
-    Construit une carte Folium centrée sur la France avec les polygones des régions.
-    - Survol: mise en évidence
-    - Clic: redirection vers Régions/NOM.HTML
-    - Infobulle: nom et code de la région
+    Emprise [[lat_min, lon_min], [lat_max, lon_max]] des régions, hors régions exclues.
+    Parcours itératif (pile explicite) des tableaux de coordonnées imbriqués.
     """
-    # Carte de base
-    m = folium.Map(
-        location=[46.6, 2.5],
-        zoom_start=5,
-        tiles="CartoDB positron",  # carte claire, lisible
-        control_scale=True,
-        prefer_canvas=True,
-        min_zoom=4,
-        max_zoom=12,
-    )
+    min_lon, min_lat, max_lon, max_lat = 180.0, 90.0, -180.0, -90.0
+    found = False
+    for feat in geojson.get("features", []):
+        if (feat.get("properties") or {}).get("nom") in exclude:
+            continue
+        stack = [(feat.get("geometry") or {}).get("coordinates") or []]
+        while stack:
+            c = stack.pop()
+            if c and isinstance(c[0], (int, float)):
+                lon, lat = c[0], c[1]
+                min_lon, max_lon = min(min_lon, lon), max(max_lon, lon)
+                min_lat, max_lat = min(min_lat, lat), max(max_lat, lat)
+                found = True
+            else:
+                stack.extend(c)
+    if not found:
+        return None
+    return [[min_lat, min_lon], [max_lat, max_lon]]
 
-    # Style des régions
-    def density_color(d):
-        try:
-            d = float(d)
-        except (TypeError, ValueError):
-            return "#2E6EEA"
-        if d < 50:
-            return "#D4EEFF"
-        if d < 100:
-            return "#9BD1FF"
-        if d < 150:
-            return "#6FB2FF"
-        if d < 250:
-            return "#3D7CFF"
-        if d < 500:
-            return "#2E6EEA"
-        return "#1F4DBF"
-
-    def style_function(feature: Dict[str, Any]) -> Dict[str, Any]:
-        dens = (feature.get("properties") or {}).get("densite_km2")
-        return {
-            "fillColor": density_color(dens),
-            "color": "#1F4DBF",
-            "weight": 1,
-            "fillOpacity": 0.35,
-        }
-
-    def highlight_function(feature: Dict[str, Any]) -> Dict[str, Any]:
-        return {
-            "weight": 3,
-            "fillOpacity": 0.55,
-            "color": "#3D7CFF",
-        }
 
-    enrich_regions_metadata(geojson)
+def _write_with_gzip(path: str, content: bytes) -> None:
+    """
+    Écrit un fichier et sa copie pré-compressée (pour un service HTTP avec Content-Encoding: gzip).
+    """
+    with open(path, "wb") as f:
+        f.write(content)
+    # mtime=0 : en-tête gzip sans horodatage, sortie identique d'une exécution à l'autre
+    with gzip.GzipFile(path + ".gz", "wb", compresslevel=6, mtime=0) as f:
+        f.write(content)
 
-    tooltip = folium.GeoJsonTooltip(fields=["nom", "code"], aliases=["Région", "Code"], sticky=True)
 
-    popup = folium.GeoJsonPopup(
-        fields=["nom", "code", "population", "surface_km2", "densite_km2", "part_population_pct"],
-        aliases=["Région", "Code", "Population", "Surface (km²)", "Densité (hab/km²)", "Part pop. (%)"],
-        localize=True,
-        labels=True,
-    )
+# Page complète, interpolée par str.format_map (accolades CSS/JS doublées)
+_PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="fr">
+<head>
+  <meta charset="utf-8" />
+  <meta name="viewport" content="width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no" />
+  <title>Qualité de l’eau potable en France — Carte interactive</title>
+  <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.css" />
+  <script src="https://cdn.jsdelivr.net/npm/leaflet@1.9.3/dist/leaflet.js"></script>
+  <style>
+    html, body {{ width: 100%; height: 100%; margin: 0; padding: 0; }}
+    #{map_id} {{ position: absolute; top: 0; bottom: 0; right: 0; left: 0; }}
+    .leaflet-container {{ font-size: 1rem; }}
+    .lg {{ display:flex; gap:6px; align-items:center; }}
+    .sw {{ display:inline-block; width:18px; height:12px; border:1px solid #1F4DBF33; }}
+  </style>
+</head>
+<body>
+  <div style="position: fixed; top: 12px; left: 12px; right: 12px; z-index: 9999;
+               max-width: 680px;
+               background: rgba(11,19,32,0.78); color: #eaeef7; padding: 12px 14px;
+               border-radius: 10px; border: 1px solid rgba(255,255,255,0.25);
+               font-family: system-ui, -apple-system, Segoe UI, Roboto, Ubuntu, Cantarell;
+               font-size: 14px;">
+    <div style="font-size:16px; font-weight:600; margin-bottom:4px;">
+      Qualité de l’eau potable en France — Carte interactive
+    </div>
+    <div style="opacity:.95; line-height:1.35;">
+      Visualisation agrégée par région sur les 12 derniers mois.
+      Survolez une région pour la mettre en évidence, puis cliquez pour ouvrir la page
+      régionale correspondante&nbsp;: <b>Régions/NOM_DE_LA_RÉGION.HTML</b>.
+    </div>
+    <div id="regions-error" style="display:none; margin-top:8px; color:#ffb4a8; font-weight:600;"></div>
+  </div>
+  <div style="position: fixed; bottom: 12px; left: 12px; z-index: 9999;
+              background: rgba(11,19,32,0.78); color: #eaeef7; padding: 10px 12px;
+              border-radius: 10px; border: 1px solid rgba(255,255,255,0.25);
+              font-family: system-ui, -apple-system, Segoe UI, Roboto, Ubuntu, Cantarell;
+              font-size: 12px; line-height: 1.2;">
+    <div style="font-weight:600; margin-bottom:6px;">Densité (hab/km²)</div>
+    {legend_rows}
+  </div>
+  <div id="{map_id}"></div>
+  <script>
+    var map = L.map({map_id_js}, {{ center: {center}, zoom: {zoom}, minZoom: 4, maxZoom: 12 }});
+    L.tileLayer("https://{{s}}.basemaps.cartocdn.com/light_all/{{z}}/{{x}}/{{y}}{{r}}.png", {{
+      attribution: '&copy; <a href="https://www.openstreetmap.org/copyright">OpenStreetMap</a> contributors '
+        + '&copy; <a href="https://carto.com/attributions">CARTO</a>',
+      subdomains: "abcd",
+      maxZoom: 20
+    }}).addTo(map);
+    L.control.scale().addTo(map);
+    // Vue initiale : emprise réelle des régions de métropole (sans restreindre la navigation)
+    map.fitBounds({bounds}, {{ padding: [20, 20] }});
 
-    gj = folium.GeoJson(
-        geojson,
-        name="Régions",
-        style_function=style_function,
-        highlight_function=highlight_function,
-        tooltip=tooltip,
-        popup=popup,
-        embed=False,
-    )
-    gj.add_to(m)
+    var highlightStyle = {{ weight: 3, fillOpacity: 0.55, color: '#3D7CFF' }};
+    var regions = null;
 
-    # Adapter la vue aux limites des régions si disponible
-    try:
-        # Centrage explicite sur la France métropolitaine
-        m.fit_bounds([[41.0, -5.5], [51.5, 10.0]])
-    except Exception:  # noqa: BLE001
-        pass
+    function attach(feature, layer) {{
+      var p = feature.properties;
+      if (!p || !p.nom) return;
+      layer.bindTooltip(
+        '<table><tr><th>Région</th><td>' + p.nom + '</td></tr>' +
+        '<tr><th>Code</th><td>' + p.code + '</td></tr></table>',
+        {{ sticky: true }}
+      );
+      layer.on('click', function() {{
+        window.location.href = "Régions/" + encodeURIComponent(p.nom) + ".HTML";
+      }});
+      // Curseur : règle .leaflet-interactive de leaflet.css (classe posée par le renderer)
+      layer.on('mouseover', function() {{ layer.setStyle(highlightStyle); }});
+      layer.on('mouseout', function() {{ regions.resetStyle(layer); }});
+    }}
+
+    fetch({geojson_path})
+      .then(function(r) {{
+        if (!r.ok) throw new Error('HTTP ' + r.status);
+        return r.json();
+      }})
+      .then(function(data) {{
+        regions = L.geoJSON(data, {{
+          renderer: L.canvas({{ padding: 0.5 }}),
+          style: function(f) {{
+            return {{ fillColor: f.properties._fill, color: '#1F4DBF', weight: 1, fillOpacity: 0.35 }};
+          }},
+          onEachFeature: attach
+        }}).addTo(map);
+        L.control.layers(null, {{ 'Régions': regions }}, {{ collapsed: true }}).addTo(map);
+      }})
+      .catch(function(err) {{
+        // Ouverture en file:// ou fichier absent : le fond de carte seul serait trompeur
+        var box = document.getElementById('regions-error');
+        box.textContent = 'Impossible de charger ' + {geojson_path} + ' (' + err.message + '). '
+          + 'Servez cette page via HTTP, par exemple : python -m http.server';
+        box.style.display = 'block';
+      }});
+  </script>
+</body>
+</html>
+"""
+
+
+def build_map(geojson: Dict[str, Any], out_file: str = "index.html") -> None:
+    """
+    Construit une carte Leaflet centrée sur la France avec les polygones des régions.
+    - Survol: mise en évidence
+    - Clic: redirection vers Régions/NOM.HTML
+    - Infobulle: nom et code de la région
+    Les polygones sont écrits dans regions.geojson, à côté de la page.
+    """
+    # Géométries dans un fichier à part (mis en cache par le navigateur), chargé par fetch()
+    enrich_regions_metadata(geojson)
+    geojson_file = "regions.geojson"
+    _write_with_gzip(os.path.join(os.path.dirname(out_file), geojson_file), _json_dumps(geojson))
 
-    # Bandeau d'instructions
-    title_html = """
-    <div style="position: fixed; top: 12px; left: 12px; right: 12px; z-index: 9999;
-                 max-width: 680px;
-                 background: rgba(11,19,32,0.78); color: #eaeef7; padding: 12px 14px;
-                 border-radius: 10px; border: 1px solid rgba(255,255,255,0.25);
-                 font-family: system-ui, -apple-system, Segoe UI, Roboto, Ubuntu, Cantarell;
-                 font-size: 14px;">
-      <div style="font-size:16px; font-weight:600; margin-bottom:4px;">
-        Qualité de l’eau potable en France — Carte interactive
-      </div>
-      <div style="opacity:.95; line-height:1.35;">
-        Visualisation agrégée par région sur les 12 derniers mois.
-        Survolez une région pour la mettre en évidence, puis cliquez pour ouvrir la page
-        régionale correspondante&nbsp;: <b>Régions/NOM_DE_LA_RÉGION.HTML</b>.
-      </div>
-    </div>"""
-    m.get_root().html.add_child(folium.Element(title_html))
-    legend_html = """
-    <div style="position: fixed; bottom: 12px; left: 12px; z-index: 9999;
-                background: rgba(11,19,32,0.78); color: #eaeef7; padding: 10px 12px;
-                border-radius: 10px; border: 1px solid rgba(255,255,255,0.25);
-                font-family: system-ui, -apple-system, Segoe UI, Roboto, Ubuntu, Cantarell;
-                font-size: 12px; line-height: 1.2;">
-      <div style="font-weight:600; margin-bottom:6px;">Densité (hab/km²)</div>
-      <div style="display:flex; gap:6px; align-items:center;">
-        <span style="display:inline-block;width:18px;height:12px;background:#D4EEFF;border:1px solid #1F4DBF33;"></span><span>< 50</span>
-      </div>
-      <div style="display:flex; gap:6px; align-items:center;">
-        <span style="display:inline-block;width:18px;height:12px;background:#9BD1FF;border:1px solid #1F4DBF33;"></span><span>50–100</span>
-      </div>
-      <div style="display:flex; gap:6px; align-items:center;">
-        <span style="display:inline-block;width:18px;height:12px;background:#6FB2FF;border:1px solid #1F4DBF33;"></span><span>100–150</span>
-      </div>
-      <div style="display:flex; gap:6px; align-items:center;">
-        <span style="display:inline-block;width:18px;height:12px;background:#3D7CFF;border:1px solid #1F4DBF33;"></span><span>150–250</span>
-      </div>
-      <div style="display:flex; gap:6px; align-items:center;">
-        <span style="display:inline-block;width:18px;height:12px;background:#2E6EEA;border:1px solid #1F4DBF33;"></span><span>250–500</span>
-      </div>
-      <div style="display:flex; gap:6px; align-items:center;">
-        <span style="display:inline-block;width:18px;height:12px;background:#1F4DBF;border:1px solid #1F4DBF33;"></span><span>≥ 500</span>
-      </div>
-    </div>"""
-    m.get_root().html.add_child(folium.Element(legend_html))
-
-    # Script pour la navigation au clic (Leaflet)
-    map_id = m.get_name()
-    js = f"""
-    <script>
-    window.addEventListener('load', function() {{
-      var map = window['{map_id}'] || {map_id};
-
-      // Centrer la vue sur la France métropolitaine (sans restreindre la navigation)
-      try {{
-        if (map && typeof L !== 'undefined' && L.latLngBounds) {{
-          var frMetropole = L.latLngBounds([[41.0, -5.5], [51.5, 10.0]]);
-          map.fitBounds(frMetropole, {{ padding: [20, 20] }});
-        }}
-      }} catch (e) {{}}
-
-      function attach(layer) {{
-        if (!layer) return;
-        var f = layer.feature;
-        if (f && f.properties && f.properties.nom) {{
-          layer.on('click', function() {{
-            var nom = f.properties.nom;
-            var url = "Régions/" + encodeURIComponent(nom) + ".HTML";
-            window.location.href = url;
-          }});
-          layer.on('mouseover', function() {{
-            try {{ map.getContainer().style.cursor = 'pointer'; }} catch(e) {{}}
-          }});
-          layer.on('mouseout', function() {{
-            try {{ map.getContainer().style.cursor = ''; }} catch(e) {{}}
-          }});
-        }}
-      }}
-      if (map && typeof map.eachLayer === 'function') {{
-        map.eachLayer(function(l) {{
-          if (typeof l.eachLayer === 'function') {{
-            l.eachLayer(function(sl) {{ attach(sl); }});
-          }} else {{
-            attach(l);
-          }}
-        }});
-      }}
-    }});
-    </script>
-    """
-    m.get_root().html.add_child(folium.Element(js))
-
-    folium.LayerControl(collapsed=True).add_to(m)
-    m.save(out_file)
+    legend_rows = "".join(
+        f'<div class="lg"><span class="sw" style="background:{c}"></span><span>{lbl}</span></div>'
+        for c, lbl in zip(_DENSITY_COLORS, _DENSITY_LABELS)
+    )
+    html = _PAGE_TEMPLATE.format_map({
+        "map_id": "map",
+        "map_id_js": json.dumps("map"),
+        "center": json.dumps([46.6, 2.5]),
+        "zoom": 5,
+        "bounds": json.dumps(bbox(geojson) or [[41.0, -5.5], [51.5, 10.0]]),
+        "geojson_path": json.dumps(geojson_file),
+        "legend_rows": legend_rows,
+    })
+    _write_with_gzip(out_file, html.encode("utf-8"))
     print(f"Carte générée dans: {out_file}")
 
 
@@ -295,7 +633,7 @@ def main() -> None:
     os.makedirs("Régions", exist_ok=True)
 
     # Construire la carte principale
-    geojson = fetch_regions_geojson()
+    geojson = simplify_geojson(fetch_regions_geojson())
     build_map(geojson, out_file="index.html")
 
 